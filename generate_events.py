@@ -6,34 +6,144 @@ Maker Event Static Site Generator
 
 import argparse
 import csv
+import functools
 import hashlib
+import html
 import json
+import os
 import re
+import shutil
 import subprocess
 import sys
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from urllib.parse import urlparse, urljoin
 import io
 import zipfile
 
 import requests
-from bs4 import BeautifulSoup, Tag
-from dateutil import parser
-from jinja2 import Environment, FileSystemLoader
-from PIL import Image, ImageDraw, ImageFont
-from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# Pillow・BeautifulSoup・Jinja2は更新不要で終了する実行では使わないため、
+# 使用する関数内で遅延インポートする
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from jinja2 import Template
+    from PIL import ImageFont
 
-class Event(BaseModel):
+
+# 日本時間
+JST = timezone(timedelta(hours=9))
+
+# 全リクエストで共有するHTTPセッション（keep-alive接続を再利用する）
+# 接続エラーと一時的なサーバーエラー・レート制限はアダプタで再試行する
+_HTTP = requests.Session()
+_HTTP.headers['User-Agent'] = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503),
+        # 外部サイトのRetry-Afterは上限なく待たされるため従わず、backoffの間隔で再試行する
+        respect_retry_after_header=False,
+        # 再試行しても失敗した場合は最後のレスポンスを返し、raise_for_statusで扱う
+        raise_on_status=False,
+    ),
+)
+_HTTP.mount('http://', _HTTP_ADAPTER)
+_HTTP.mount('https://', _HTTP_ADAPTER)
+
+# 画像取得の並行数（全体）と同一ホストへの同時接続数の上限
+IMAGE_FETCH_WORKERS = 16
+IMAGE_FETCH_PER_HOST = 4
+
+# OGP/Twitterのmetaタグは<head>内にあるため、</head>までか先頭256KBのみ読み込む
+# （インラインのスクリプトやスタイルで<head>が64KBを超えるページもあるため余裕を持たせる）
+_HEAD_READ_LIMIT = 262144
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+# og:imageはproperty/contentどちらの属性が先でも検出する
+_OG_IMAGE_RES = (
+    re.compile(rb'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)', re.I),
+    re.compile(rb'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']', re.I),
+)
+
+# 地域列の括弧内の国名、スプレッドシートID、Google FontsのTTF URL
+_REGION_RE = re.compile(r'\(([^)]+)\)')
+_SHEET_ID_RE = re.compile(r'/spreadsheets/d/([a-zA-Z0-9-_]+)')
+_GSTATIC_TTF_RE = re.compile(r'https://fonts\.gstatic\.com[^)]+\.ttf')
+
+# parse_eventsで使用するスプレッドシートの列名（画像は任意の列）
+SHEET_COLUMNS = ('名称', '場所', '地域', 'から', 'まで', 'URL', '備考', '画像')
+
+# Jinja2のバイトコードキャッシュの保存先
+JINJA_CACHE_DIR = ".jinja_cache"
+
+# イベントカードに表示する備考の最大文字数
+DESCRIPTION_MAX_LENGTH = 150
+
+# OGP画像の出力先
+OGP_IMAGE_FILE = "ogp_image.png"
+
+# ダウンロードしたフォントの保存先（作業ディレクトリに関係なく再利用する）
+FONT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'maker_event'
+FONT_FILE_NAME = "NotoSansJP-Bold.ttf"
+# Boldを取得できない場合の代替（Regular。Boldと混同しないよう別名で保存し、太さは縁取りで補う）
+FALLBACK_FONT_FILE_NAME = "NotoSansJP-Regular.ttf"
+FALLBACK_FONT_URLS = (
+    "https://fonts.gstatic.com/s/notosansjp/v54/-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFBEj75s.ttf",
+    "https://fonts.gstatic.com/s/notosansjp/v54/-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFPYk75s.ttf",
+)
+
+# 画像URLキャッシュ（実行をまたいでOGP画像の取得結果を再利用する）
+IMAGE_CACHE_FILE = ".image_cache.json"
+IMAGE_CACHE_TTL = timedelta(days=14)
+
+# 画像が見つからなかったホスト（期限内は同じホストの別URLも取得しない）
+NO_IMAGE_HOSTS_FILE = ".no_image_hosts.json"
+NO_IMAGE_HOSTS_TTL = timedelta(days=30)
+
+# 日本のイベントと判定する国名（小文字）
+JAPAN_COUNTRY_NAMES = frozenset({'japan', '日本', 'jp'})
+
+# パース済み日付のキャッシュ（同じ日付文字列は一度だけパースする）
+_DATE_CACHE: Dict[str, datetime] = {}
+
+
+def _parse_date(value: str) -> datetime:
+    """スプレッドシートの日付文字列（YYYY/M/D）をパース"""
+    # 月日をゼロ埋めしてキャッシュのヒット率を上げる（2025/8/2 → 2025/08/02）
+    key = '/'.join(part.zfill(2) for part in value.strip().split('/'))
+    cached = _DATE_CACHE.get(key)
+    if cached is None:
+        try:
+            cached = datetime.strptime(key, "%Y/%m/%d")
+        except ValueError:
+            cached = datetime.strptime(key, "%Y/%m/%d %H:%M")
+        _DATE_CACHE[key] = cached
+    return cached
+
+
+# Python 3.10以降はスロットを使い、イベントごとのメモリと属性アクセスを軽くする
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Event:
     """イベントデータモデル"""
     name: str
-    date: Optional[str] = None
     location: str
     country: str
+    date: Optional[str] = None
     description: str = ""
     url: str = ""
     image_url: str = ""
@@ -43,19 +153,24 @@ class Event(BaseModel):
     date_to: Optional[str] = None
     parsed_date_from: Optional[datetime] = None
     parsed_date_to: Optional[datetime] = None
+    # HTML表示用（generate_htmlでレンダリング前に設定）
+    display_location: str = ""
+    display_description: str = ""
+    description_truncated: bool = False
+    formatted_date: str = ""
     
-    def model_post_init(self, __context):
+    def __post_init__(self):
         """初期化後処理"""
         if self.date:
             try:
-                self.parsed_date = parser.parse(self.date)
+                self.parsed_date = _parse_date(self.date)
             except:
                 self.parsed_date = None
         
         # 開始日と終了日をパース
         if self.date_from:
             try:
-                self.parsed_date_from = parser.parse(self.date_from)
+                self.parsed_date_from = _parse_date(self.date_from)
                 # parsed_dateを開始日に設定（ソート用）
                 if not self.parsed_date:
                     self.parsed_date = self.parsed_date_from
@@ -64,23 +179,17 @@ class Event(BaseModel):
         
         if self.date_to:
             try:
-                self.parsed_date_to = parser.parse(self.date_to)
+                self.parsed_date_to = _parse_date(self.date_to)
             except:
                 self.parsed_date_to = None
         
-        self.is_japan = self.country.lower() in ['japan', '日本', 'jp']
+        self.is_japan = self.country.lower() in JAPAN_COUNTRY_NAMES
 
 
+@functools.lru_cache(maxsize=1)
 def load_country_mapping() -> Dict[str, str]:
     """国名マッピングファイルを読み込み"""
-    mapping_file = Path("country_mapping.json")
-    if mapping_file.exists():
-        try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️  国名マッピングファイル読み込みエラー: {e}")
-    return {}
+    return _read_json(Path("country_mapping.json"), "国名マッピング")
 
 
 def extract_country_from_region(region: str, country_mapping: Dict[str, str]) -> str:
@@ -92,7 +201,7 @@ def extract_country_from_region(region: str, country_mapping: Dict[str, str]) ->
     - "サンフランシスコ(アメリカ)" → "USA"
     """
     # 括弧内の国名を抽出
-    match = re.search(r'\(([^)]+)\)', region)
+    match = _REGION_RE.search(region)
     if match:
         country_name_ja = match.group(1)
         # マッピングから英語の国名を取得
@@ -102,25 +211,20 @@ def extract_country_from_region(region: str, country_mapping: Dict[str, str]) ->
     return "Japan"
 
 
+@functools.lru_cache(maxsize=16)
 def get_spreadsheet_csv_url(sheet_url: str) -> str:
     """Google SheetsのURLをCSVエクスポート用URLに変換"""
     if 'docs.google.com/spreadsheets' in sheet_url:
-        sheet_id = re.search(r'/spreadsheets/d/([a-zA-Z0-9-_]+)', sheet_url)
+        sheet_id = _SHEET_ID_RE.search(sheet_url)
         if sheet_id:
             return f"https://docs.google.com/spreadsheets/d/{sheet_id.group(1)}/export?format=csv"
     return sheet_url
 
 
+@functools.lru_cache(maxsize=1)
 def load_last_state() -> Dict:
     """前回の状態をファイルから読み込み"""
-    state_file = Path(".last_state.json")
-    if state_file.exists():
-        try:
-            with open(state_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️  前回の状態ファイル読み込みエラー: {e}")
-    return {}
+    return _read_json(Path(".last_state.json"), "前回の状態")
 
 
 def save_last_state(state: Dict) -> None:
@@ -131,11 +235,20 @@ def save_last_state(state: Dict) -> None:
             json.dump(state, f, ensure_ascii=False, indent=2)
     except Exception as e:
         print(f"⚠️  状態ファイル保存エラー: {e}")
+    finally:
+        # 次回の読み込みで保存後の内容を返すようにキャッシュを破棄
+        load_last_state.cache_clear()
 
 
-def get_content_hash(content: str) -> str:
+def get_content_hash(content: bytes) -> str:
     """コンテンツのハッシュ値を計算"""
-    return hashlib.md5(content.encode('utf-8')).hexdigest()
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_events_hash(events: List[Event]) -> str:
+    """OGP画像に描画されるイベント内容のハッシュ値を計算"""
+    key = [(e.name, e.date_from, e.date_to, e.is_japan) for e in events]
+    return get_content_hash(json.dumps(key, ensure_ascii=False).encode('utf-8'))
 
 
 def has_spreadsheet_changed(sheet_url: str) -> tuple[bool, str]:
@@ -148,11 +261,10 @@ def has_spreadsheet_changed(sheet_url: str) -> tuple[bool, str]:
     
     try:
         # 現在のスプレッドシート内容を取得
-        response = requests.get(csv_url, timeout=30)
+        response = _HTTP.get(csv_url, timeout=30)
         response.raise_for_status()
-        response.encoding = 'utf-8'
-        current_content = response.text
-        current_hash = get_content_hash(current_content)
+        # デコードせずにバイト列のままハッシュ化
+        current_hash = get_content_hash(response.content)
         
         # 前回の状態を読み込み
         last_state = load_last_state()
@@ -213,19 +325,21 @@ def should_update_page(sheet_url: str) -> tuple[bool, str]:
 def auto_commit_and_push() -> bool:
     """変更をGitリポジトリにコミット・プッシュ"""
     try:
-        # 変更があるかチェック
-        result = subprocess.run(['git', 'diff', '--quiet'], capture_output=True)
-        staged_result = subprocess.run(['git', 'diff', '--cached', '--quiet'], capture_output=True)
+        files_to_add = ['index.html', 'ogp_image.png', '.last_state.json', IMAGE_CACHE_FILE, NO_IMAGE_HOSTS_FILE]
         
-        if result.returncode == 0 and staged_result.returncode == 0:
+        # 対象ファイルに変更があるかを1回のgit statusでチェック
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--'] + files_to_add,
+            capture_output=True, text=True, check=True
+        )
+        
+        if not status.stdout.strip():
             print("📝 Gitリポジトリに変更がありません")
             return False
         
-        # ファイルをステージング
-        files_to_add = ['index.html', 'ogp_image.png', '.last_state.json']
-        for file in files_to_add:
-            if Path(file).exists():
-                subprocess.run(['git', 'add', file], check=True)
+        # 存在するファイルをまとめてステージング
+        existing_files = [file for file in files_to_add if Path(file).exists()]
+        subprocess.run(['git', 'add', '--'] + existing_files, check=True, stdout=subprocess.DEVNULL)
         
         # コミットメッセージを生成
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S JST')
@@ -236,11 +350,11 @@ def auto_commit_and_push() -> bool:
 Generated with [Claude Code](https://claude.ai/code)"""
         
         # コミット
-        subprocess.run(['git', 'commit', '-m', commit_message], check=True)
+        subprocess.run(['git', 'commit', '-m', commit_message], check=True, stdout=subprocess.DEVNULL)
         print(f"✅ 変更をコミットしました")
         
         # プッシュ
-        subprocess.run(['git', 'push'], check=True)
+        subprocess.run(['git', 'push'], check=True, stdout=subprocess.DEVNULL)
         print(f"🚀 リポジトリにプッシュしました")
         
         return True
@@ -253,165 +367,350 @@ Generated with [Claude Code](https://claude.ai/code)"""
         return False
 
 
-def fetch_events_from_sheet(sheet_url: str) -> List[Dict]:
-    """Google Sheetsからイベントデータを取得"""
+def fetch_events_from_sheet(sheet_url: str) -> tuple[Dict[str, int], List[List[str]]]:
+    """Google Sheetsからイベントデータを取得
+    
+    Returns:
+        tuple[Dict[str, int], List[List[str]]]: (列名→列番号, データ行)
+    """
     csv_url = get_spreadsheet_csv_url(sheet_url)
     
     try:
-        response = requests.get(csv_url, timeout=30)
+        response = _HTTP.get(csv_url, timeout=30, stream=True)
         response.raise_for_status()
         
-        # UTF-8エンコーディングを明示的に指定
+        # UTF-8エンコーディングを明示的に指定し、受信しながら行単位でパース
         response.encoding = 'utf-8'
-        csv_content = response.text
-        reader = csv.DictReader(csv_content.splitlines())
+        reader = csv.reader(response.iter_lines(chunk_size=65536, decode_unicode=True))
         
-        events = []
-        for row in reader:
-            if row and any(row.values()):
-                events.append(dict(row))
+        # 使用する列の位置をヘッダー行から一度だけ求める
+        header = next(reader, [])
+        columns = {name: header.index(name) for name in SHEET_COLUMNS if name in header}
         
-        return events
+        return columns, [row for row in reader if any(row)]
     except Exception as e:
         print(f"Error fetching spreadsheet data: {e}")
-        return []
+        return {}, []
 
 
-def extract_image_from_url(url: str) -> str:
-    """URLからOGP画像やファビコンを取得"""
-    if not url or not url.startswith('http'):
+def _cell(row: List[str], index: Optional[int]) -> str:
+    """行から指定位置のセル値を取得（列がない場合は空文字）"""
+    if index is None or index >= len(row):
         return ""
+    return row[index].strip()
+
+
+def load_image_cache() -> Dict[str, Dict]:
+    """画像URLキャッシュをファイルから読み込み"""
+    return _read_json(Path(IMAGE_CACHE_FILE), "画像キャッシュ")
+
+
+def _read_json(path: Path, label: str) -> Dict:
+    """JSONファイルを読み込み（存在しない・読み込めない・辞書でない場合は空の辞書）"""
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            print(f"⚠️  {label}ファイルの形式が不正なため無視します")
+        except Exception as e:
+            print(f"⚠️  {label}ファイル読み込みエラー: {e}")
+    return {}
+
+
+def _write_json_atomic(path: Path, data: Dict) -> None:
+    """JSONを一時ファイルに書き出してから置き換える
     
+    書き込み途中で中断されても壊れたファイルが残らないようにする。
+    """
+    tmp_file = path.with_name(path.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_file, path)
+
+
+def save_image_cache(cache: Dict[str, Dict]) -> None:
+    """画像URLキャッシュをファイルに保存"""
     try:
-        # User-Agentを設定してリクエスト
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        _write_json_atomic(Path(IMAGE_CACHE_FILE), cache)
+    except Exception as e:
+        print(f"⚠️  画像キャッシュファイル保存エラー: {e}")
+
+
+def is_within_ttl(recorded_at: str, now: datetime, ttl: timedelta) -> bool:
+    """ISO形式の記録日時が有効期限内かチェック（不正な値は期限切れとみなす）"""
+    try:
+        return now - datetime.fromisoformat(recorded_at) < ttl
+    except Exception:
+        return False
+
+
+def is_image_cache_fresh(entry: Dict, now: datetime) -> bool:
+    """画像キャッシュのエントリが有効期限内かチェック"""
+    return isinstance(entry, dict) and is_within_ttl(entry.get('fetched_at', ''), now, IMAGE_CACHE_TTL)
+
+
+def load_no_image_hosts() -> Dict[str, str]:
+    """画像が見つからなかったホストの一覧をファイルから読み込み"""
+    return _read_json(Path(NO_IMAGE_HOSTS_FILE), "画像なしホスト")
+
+
+def save_no_image_hosts(hosts: Dict[str, str]) -> None:
+    """画像が見つからなかったホストの一覧をファイルに保存"""
+    try:
+        _write_json_atomic(Path(NO_IMAGE_HOSTS_FILE), hosts)
+    except Exception as e:
+        print(f"⚠️  画像なしホストファイル保存エラー: {e}")
+
+
+def extract_image_from_url(url: str, cache_entry: Optional[Dict] = None) -> Optional[Dict]:
+    """URLからOGP画像やファビコンを取得
+    
+    cache_entryにETag/Last-Modifiedがあれば条件付きリクエストを送り、
+    304 Not Modifiedの場合はキャッシュ済みの画像URLを再利用する。
+    
+    Returns:
+        Optional[Dict]: 画像キャッシュのエントリ（取得エラー時はNone）
+    """
+    if not url or not url.startswith('http'):
+        return None
+    
+    # HTMLページのみを要求する（gzip等の圧縮はrequestsが既定で要求する）
+    headers = {'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.1'}
+    if cache_entry:
+        if cache_entry.get('etag'):
+            headers['If-None-Match'] = cache_entry['etag']
+        if cache_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cache_entry['last_modified']
+    
+    try:
+        # ページ先頭（<head>部分）のみ読み込む
+        with _HTTP.get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304 and cache_entry:
+                return dict(cache_entry, fetched_at=datetime.now().isoformat())
+            response.raise_for_status()
+            head, head_complete = _read_html_head(response)
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+        
+        image_url = _find_image_url(head, url)
+        # <head>が読み込み上限を超えて途中までしか見ていない場合、画像なしとは断定できないため
+        # キャッシュや画像なしホストに記録されないよう取得エラーとして扱う
+        if not image_url and not head_complete:
+            print(f"⚠️  <head>が{_HEAD_READ_LIMIT // 1024}KBを超えるため画像を判定できません ({url})")
+            return None
+        
+        return {
+            'image_url': image_url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': datetime.now().isoformat(),
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # OGP画像を優先的に取得
-        og_image = soup.find('meta', property='og:image')
-        if og_image and isinstance(og_image, Tag):
-            content = og_image.get('content')
-            if content and isinstance(content, str):
-                image_url = content
-                # 相対URLの場合は絶対URLに変換
-                if image_url.startswith('/'):
-                    image_url = urljoin(url, image_url)
-                return image_url
-        
-        # Twitter Card画像を試す
-        twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-        if twitter_image and isinstance(twitter_image, Tag):
-            content = twitter_image.get('content')
-            if content and isinstance(content, str):
-                image_url = content
-                if image_url.startswith('/'):
-                    image_url = urljoin(url, image_url)
-                return image_url
-        
-        # ファビコンを最後の手段として取得
-        favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
-        if favicon and isinstance(favicon, Tag):
-            href = favicon.get('href')
-            if href and isinstance(href, str):
-                favicon_url = href
-                if favicon_url.startswith('/'):
-                    favicon_url = urljoin(url, favicon_url)
-                return favicon_url
-        
-        return ""
-        
     except Exception as e:
         print(f"画像取得エラー ({url}): {e}")
-        return ""
+        return None
+
+
+def _find_image_url(head: bytes, url: str) -> str:
+    """<head>部分のHTMLから画像URLを探す"""
+    # まずは最優先のOGP画像を正規表現で探す
+    for pattern in _OG_IMAGE_RES:
+        match = pattern.search(head)
+        if match:
+            image_url = html.unescape(match.group(1).decode('utf-8', errors='replace'))
+            return urljoin(url, image_url.strip())
+    
+    # 見つからない場合はBeautifulSoupで解析（og:image > twitter:image > ファビコンの順）
+    # Twitter Card画像を正規表現で先に拾うと、検出できなかったog:imageより優先されてしまうため
+    # 参照するのはmeta/linkタグのみのため、それ以外の要素はツリーに構築しない
+    from bs4 import BeautifulSoup, SoupStrainer
+    soup = BeautifulSoup(head, 'html.parser', parse_only=SoupStrainer(['meta', 'link']))
+    return _extract_image_from_soup(soup, url)
 
 
+def _read_html_head(response: requests.Response) -> tuple[bytes, bool]:
+    """レスポンスを</head>まで（最大_HEAD_READ_LIMITバイト）読み込む
+    
+    Returns:
+        tuple[bytes, bool]: (読み込んだHTML, </head>までまたはページ全体を読み切ったか)
+    """
+    buf = bytearray()
+    for chunk in response.iter_content(chunk_size=8192):
+        # チャンク境界をまたぐ</head>も検出できるよう、直前の末尾から検索する
+        search_from = max(0, len(buf) - 16)
+        buf += chunk
+        if len(buf) >= _HEAD_READ_LIMIT or _HEAD_END_RE.search(buf, search_from):
+            break
+    else:
+        # 上限に達する前にページ全体を読み切った
+        return bytes(buf), True
+    head = bytes(buf[:_HEAD_READ_LIMIT])
+    return head, _HEAD_END_RE.search(head) is not None
+
+
+def _extract_image_from_soup(soup: "BeautifulSoup", url: str) -> str:
+    """解析済みHTMLからOGP画像やファビコンを取得"""
+    from bs4 import Tag
+    
+    # OGP画像を優先的に取得
+    og_image = soup.find('meta', property='og:image')
+    if og_image and isinstance(og_image, Tag):
+        content = og_image.get('content')
+        if content and isinstance(content, str):
+            image_url = content
+            # 相対URLの場合は絶対URLに変換
+            if image_url.startswith('/'):
+                image_url = urljoin(url, image_url)
+            return image_url
+    
+    # Twitter Card画像を試す
+    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
+    if twitter_image and isinstance(twitter_image, Tag):
+        content = twitter_image.get('content')
+        if content and isinstance(content, str):
+            image_url = content
+            if image_url.startswith('/'):
+                image_url = urljoin(url, image_url)
+            return image_url
+    
+    # ファビコンを最後の手段として取得
+    favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
+    if favicon and isinstance(favicon, Tag):
+        href = favicon.get('href')
+        if href and isinstance(href, str):
+            favicon_url = href
+            if favicon_url.startswith('/'):
+                favicon_url = urljoin(url, favicon_url)
+            return favicon_url
+    
+    return ""
+
+
+@functools.lru_cache(maxsize=1)
 def download_noto_font() -> Optional[str]:
-    """Noto Sans JP フォントをダウンロード"""
-    font_path = "NotoSansJP-Regular.ttf"
+    """Noto Sans JP フォント（Bold）をダウンロード
+    
+    Boldを取得できない場合はRegularを別名で保存して使用する。
+    Regularで代替した場合も、次回の実行では再びBoldの取得を試みる。
+    """
+    font_path = FONT_CACHE_DIR / FONT_FILE_NAME
     
     # フォントファイルが既に存在する場合はそれを使用
-    if Path(font_path).exists():
-        return font_path
+    # （検証済みのファイルのみ置き換えで配置するため、存在すれば完全なファイル）
+    if font_path.exists():
+        return str(font_path)
     
     # Google Fonts APIから最新のフォントURLを取得
+    font_urls = []
     try:
         print("📡 Google Fonts APIからフォントURL取得中...")
-        css_response = requests.get(
-            "https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400&display=swap",
+        css_response = _HTTP.get(
+            "https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@700&display=swap",
             headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
             timeout=10
         )
         css_response.raise_for_status()
         
         # CSSからフォントURLを抽出
-        import re
-        font_urls = re.findall(r'https://fonts\.gstatic\.com[^)]+\.ttf', css_response.text)
+        font_urls = _GSTATIC_TTF_RE.findall(css_response.text)
         if font_urls:
             print(f"✅ {len(font_urls)}個のフォントURLを発見")
         else:
-            # フォールバック用の固定URL
-            font_urls = [
-                "https://fonts.gstatic.com/s/notosansjp/v54/-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFBEj75s.ttf",
-                "https://fonts.gstatic.com/s/notosansjp/v54/-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFPYk75s.ttf"
-            ]
-            print("⚠️ フォールバックURLを使用")
+            print("⚠️ CSSにフォントURLが見つかりません")
             
     except Exception as e:
         print(f"❌ Google Fonts API取得エラー: {e}")
-        # 最終フォールバック
-        font_urls = [
-            "https://fonts.gstatic.com/s/notosansjp/v54/-F6jfjtqLzI2JPCgQBnw7HFyzSD-AsregP8VFBEj75s.ttf"
-        ]
     
-    for i, font_url in enumerate(font_urls, 1):
-        try:
-            print(f"📥 Noto Sans JP フォントをダウンロード中... ({i}/{len(font_urls)})")
-            print(f"   URL: {font_url}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(font_url, headers=headers, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # コンテンツタイプを確認
-            content_type = response.headers.get('content-type', '')
-            if 'font' not in content_type and 'octet-stream' not in content_type:
-                print(f"⚠️  予期しないコンテンツタイプ: {content_type}")
-                continue
-            
-            with open(font_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            # ファイルサイズを確認
-            file_size = Path(font_path).stat().st_size
-            if file_size < 100000:  # 100KB未満の場合は無効とみなす
-                print(f"⚠️  ダウンロードしたファイルサイズが小さすぎます: {file_size} bytes")
-                Path(font_path).unlink(missing_ok=True)
-                continue
-            
-            print(f"✅ フォントを保存: {font_path} ({file_size:,} bytes)")
-            return font_path
-            
-        except Exception as e:
-            print(f"❌ URL {i} でエラー: {e}")
-            continue
+    for font_url in font_urls:
+        if _download_font(font_url, font_path):
+            return str(font_path)
+    
+    # Boldを取得できなかった場合はRegularで代替
+    fallback_path = FONT_CACHE_DIR / FALLBACK_FONT_FILE_NAME
+    if fallback_path.exists():
+        print(f"⚠️ 保存済みの代替フォント（Regular）を使用: {fallback_path}")
+        return str(fallback_path)
+    
+    print("⚠️ フォールバックURLを使用")
+    for font_url in FALLBACK_FONT_URLS:
+        if _download_font(font_url, fallback_path):
+            return str(fallback_path)
     
     # 全てのURLが失敗した場合
     print("⚠️  すべてのフォントダウンロードが失敗しました。システムフォントを使用します")
     return None
 
 
-def create_ogp_image(events: List[Event]) -> str:
-    """OGP用のガントチャート風画像を生成"""
+def _download_font(font_url: str, font_path: Path) -> bool:
+    """フォントをダウンロードし、検証できた場合のみfont_pathに保存"""
+    from PIL import ImageFont
+    
+    try:
+        print("📥 Noto Sans JP フォントをダウンロード中...")
+        print(f"   URL: {font_url}")
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        response = _HTTP.get(font_url, headers=headers, timeout=30, stream=True)
+        response.raise_for_status()
+        
+        # コンテンツタイプを確認
+        content_type = response.headers.get('content-type', '')
+        if 'font' not in content_type and 'octet-stream' not in content_type:
+            print(f"⚠️  予期しないコンテンツタイプ: {content_type}")
+            return False
+        
+        # 一時ファイルに保存し、検証できた場合のみ正式なパスに置き換える
+        font_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = font_path.with_name(font_path.name + '.tmp')
+        # 受信データをそのままファイルへ書き出す（圧縮されていれば展開する）
+        response.raw.decode_content = True
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=65536)
+            file_size = f.tell()
+        
+        # 途中で切れていないか（Content-Lengthと一致するか）と、フォントとして読み込めるかを確認
+        expected_size = response.headers.get('content-length')
+        if expected_size and not response.headers.get('content-encoding') and file_size != int(expected_size):
+            print(f"⚠️  ダウンロードが不完全です: {file_size:,} / {int(expected_size):,} bytes")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        try:
+            ImageFont.truetype(str(tmp_path), 12)
+        except OSError as e:
+            print(f"⚠️  フォントファイルとして読み込めません: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        
+        os.replace(tmp_path, font_path)
+        print(f"✅ フォントを保存: {font_path} ({file_size:,} bytes)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ フォントダウンロードエラー: {e}")
+        return False
+
+
+@functools.lru_cache(maxsize=16)
+def _get_font(font_path: str, size: int) -> "ImageFont.FreeTypeFont":
+    """フォントを読み込み（パスとサイズごとにキャッシュ）"""
+    from PIL import ImageFont
+    
+    # 複雑な字形処理は不要なためBASICレイアウトエンジンを使用
+    return ImageFont.truetype(font_path, size, layout_engine=ImageFont.Layout.BASIC)
+
+
+def create_ogp_image(events: List[Event]) -> tuple[str, bool]:
+    """OGP用のガントチャート風画像を生成
+    
+    Returns:
+        tuple[str, bool]: (画像のパス（生成エラー時は空文字）, Noto Sans JP Boldで描画したか)
+    """
+    from PIL import Image, ImageDraw, ImageFont
+    
     try:
         # 画像サイズ (1200x630 - OGP推奨サイズ)
         width, height = 1200, 630
@@ -422,14 +721,18 @@ def create_ogp_image(events: List[Event]) -> str:
         
         # フォントの設定
         font_path = download_noto_font()
+        # 代替フォント（Regular・デフォルト）で描画した画像は、次回以降に作り直す必要がある
+        bold_font = False
         
         try:
-            if font_path and Path(font_path).exists():
+            # download_noto_fontは検証済みで存在するパスのみ返す
+            if font_path:
                 # Noto Sans JP Boldフォントを使用（サイズをさらに大きく、太く）
-                title_font = ImageFont.truetype(font_path, 36)
-                event_font = ImageFont.truetype(font_path, 20)
-                date_font = ImageFont.truetype(font_path, 16)
-                stats_font = ImageFont.truetype(font_path, 18)
+                title_font = _get_font(font_path, 36)
+                event_font = _get_font(font_path, 20)
+                date_font = _get_font(font_path, 16)
+                stats_font = _get_font(font_path, 18)
+                bold_font = Path(font_path).name == FONT_FILE_NAME
             else:
                 # フォールバック（デフォルトフォント）
                 title_font = ImageFont.load_default()
@@ -442,21 +745,18 @@ def create_ogp_image(events: List[Event]) -> str:
         
         # ヘッダー部分
         header_height = 80
-        draw.rectangle([0, 0, width, header_height], fill='#16213e')
+        # 単色の塗りつぶしはpasteで直接行う（rectangleと同じく下端の行を含む）
+        img.paste('#16213e', (0, 0, width, header_height + 1))
         
         # タイトル - 太字効果
         title = "Upcoming Maker Events Timeline"
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        title_x = (width - title_width) // 2
+        # 中央寄せに必要なのは幅だけのため、バウンディングボックスではなく送り幅を測る
+        title_width = title_font.getlength(title)
+        title_x = int((width - title_width) // 2)
         
-        # 太字効果のための重複描画
-        for dx in range(3):
-            for dy in range(3):
-                if dx == 1 and dy == 1:
-                    continue
-                draw.text((title_x + dx - 1, 25 + dy - 1), title, fill='white', font=title_font)
-        draw.text((title_x, 25), title, fill='white', font=title_font)
+        # 太字効果は同色の縁取りで表現
+        draw.text((title_x, 25), title, fill='white', font=title_font,
+                  stroke_width=1, stroke_fill='white')
         
         # 統計情報行を削除（コメントアウト）
         
@@ -472,14 +772,20 @@ def create_ogp_image(events: List[Event]) -> str:
         if not display_events:
             # イベントがない場合のメッセージ
             no_events_text = "No upcoming events scheduled"
-            no_events_bbox = draw.textbbox((0, 0), no_events_text, font=event_font)
-            no_events_width = no_events_bbox[2] - no_events_bbox[0]
-            no_events_x = (width - no_events_width) // 2
+            no_events_width = event_font.getlength(no_events_text)
+            no_events_x = int((width - no_events_width) // 2)
             draw.text((no_events_x, height // 2), no_events_text, fill='#8892b0', font=event_font)
         else:
-            # 日付範囲を計算
-            earliest_date = min(e.parsed_date for e in display_events if e.parsed_date)
-            latest_date = max(e.parsed_date for e in display_events if e.parsed_date)
+            # 日付範囲を1パスで計算
+            earliest_date = latest_date = None
+            for e in display_events:
+                d = e.parsed_date
+                if d is None:
+                    continue
+                if earliest_date is None or d < earliest_date:
+                    earliest_date = d
+                if latest_date is None or d > latest_date:
+                    latest_date = d
             
             if earliest_date and latest_date:
                 date_range = (latest_date - earliest_date).days
@@ -490,9 +796,10 @@ def create_ogp_image(events: List[Event]) -> str:
                 timeline_start_x = 200
                 timeline_width = width - timeline_start_x - 50
                 
-                # 月のヘッダーを描画
+                # 各イベントの描画内容（位置・色・表示文字列）と月の区切り位置を1パスで計算
                 current_month = None
                 month_positions = []
+                layout = []
                 
                 for i, event in enumerate(display_events):
                     if not event.parsed_date:
@@ -503,42 +810,50 @@ def create_ogp_image(events: List[Event]) -> str:
                     x_pos = timeline_start_x + (days_from_start / date_range) * timeline_width
                     y_pos = chart_start_y + (i % max_rows) * row_height
                     
+                    # バーの色（日本か海外かで色分け）
+                    bar_color = '#667eea' if event.is_japan else '#f093fb'
+                    
+                    # イベント名（長い場合は省略）
+                    event_name = event.name
+                    if len(event_name) > 25:
+                        event_name = event_name[:22] + "..."
+                    
+                    # 日付（複数日程対応）
+                    multi_day = bool(event.parsed_date_to and event.parsed_date_from != event.parsed_date_to)
+                    if multi_day and event.parsed_date_from:
+                        if event.parsed_date_from.month == event.parsed_date_to.month:
+                            # 同月の場合: 08/02-03
+                            date_text = f"{event.parsed_date_from.strftime('%m/%d')}-{event.parsed_date_to.strftime('%d')}"
+                        else:
+                            # 月またぎの場合: 08/31-09/01
+                            date_text = f"{event.parsed_date_from.strftime('%m/%d')}-{event.parsed_date_to.strftime('%m/%d')}"
+                    elif event.parsed_date_from:
+                        # 単一日の場合
+                        date_text = event.parsed_date_from.strftime('%m/%d')
+                    else:
+                        date_text = event.parsed_date.strftime('%m/%d')
+                    
+                    layout.append((x_pos, y_pos, bar_color, multi_day, event_name, date_text))
+                    
                     # 月が変わった場合の区切り線
-                    event_month = event.parsed_date.strftime('%Y-%m')
+                    event_month = (event.parsed_date.year, event.parsed_date.month)
                     if event_month != current_month:
-                        month_positions.append((x_pos, event_month))
+                        month_positions.append((x_pos, event.parsed_date.strftime('%m月')))
                         current_month = event_month
                 
-                # 月の区切り線を描画
-                for pos, month in month_positions:
+                # 月の区切り線を描画（イベントバーの下になるよう先に描画）
+                for pos, month_text in month_positions:
                     draw.line([pos, chart_start_y, pos, height - 40], fill='#16213e', width=2)
-                    month_text = datetime.strptime(month, '%Y-%m').strftime('%m月')
                     
                     # 月の文字も太字効果
-                    for dx in range(2):
-                        for dy in range(2):
-                            if dx == 0 and dy == 0:
-                                continue
-                            draw.text((pos + 5 + dx, chart_start_y - 15 + dy), month_text, fill='#8892b0', font=date_font)
-                    draw.text((pos + 5, chart_start_y - 15), month_text, fill='#8892b0', font=date_font)
+                    draw.text((pos + 5, chart_start_y - 15), month_text, fill='#8892b0', font=date_font,
+                              stroke_width=1, stroke_fill='#8892b0')
                 
                 # イベントバーを描画
-                for i, event in enumerate(display_events):
-                    if not event.parsed_date:
-                        continue
-                        
-                    y_pos = chart_start_y + (i % max_rows) * row_height
-                    
-                    # イベントの位置を計算
-                    days_from_start = (event.parsed_date - earliest_date).days
-                    x_pos = timeline_start_x + (days_from_start / date_range) * timeline_width
-                    
-                    # バーの色（日本か海外かで色分け）
-                    bar_color = '#667eea' if event.is_japan else '#f093fb'
-                    
+                dot_size = 8
+                for x_pos, y_pos, bar_color, multi_day, event_name, date_text in layout:
                     # イベントバーを描画（複数日程は丸角長方形、単一日は正円）
-                    dot_size = 8
-                    if event.parsed_date_to and event.parsed_date_from != event.parsed_date_to:
+                    if multi_day:
                         # 複数日程の場合は丸角長方形（角丸長方形）
                         width_extend = 8
                         left = x_pos - dot_size - width_extend
@@ -569,59 +884,31 @@ def create_ogp_image(events: List[Event]) -> str:
                         draw.ellipse([x_pos - dot_size, y_pos + 10, x_pos + dot_size, y_pos + 26], 
                                    fill=bar_color, outline='white', width=2)
                     
-                    # イベント名を描画（左側）- 太字効果のため少しずらして重複描画
-                    event_name = event.name
-                    if len(event_name) > 25:
-                        event_name = event_name[:22] + "..."
-                    
-                    # 太字効果のための重複描画
-                    for dx in range(2):
-                        for dy in range(2):
-                            if dx == 0 and dy == 0:
-                                continue
-                            draw.text((20 + dx, y_pos + 12 + dy), event_name, fill='white', font=event_font)
-                    draw.text((20, y_pos + 12), event_name, fill='white', font=event_font)
+                    # イベント名を描画（左側）- 太字効果
+                    draw.text((20, y_pos + 12), event_name, fill='white', font=event_font,
+                              stroke_width=1, stroke_fill='white')
                     
                     # 日付を描画（ドットの右側）- 太字効果
-                    # 複数日程対応
-                    if event.parsed_date_to and event.parsed_date_from and event.parsed_date_from != event.parsed_date_to:
-                        if event.parsed_date_from.month == event.parsed_date_to.month:
-                            # 同月の場合: 08/02-03
-                            date_text = f"{event.parsed_date_from.strftime('%m/%d')}-{event.parsed_date_to.strftime('%d')}"
-                        else:
-                            # 月またぎの場合: 08/31-09/01
-                            date_text = f"{event.parsed_date_from.strftime('%m/%d')}-{event.parsed_date_to.strftime('%m/%d')}"
-                    else:
-                        # 単一日の場合
-                        if event.parsed_date_from:
-                            date_text = event.parsed_date_from.strftime('%m/%d')
-                        elif event.parsed_date:
-                            date_text = event.parsed_date.strftime('%m/%d')
-                        else:
-                            date_text = "TBD"
-                    
-                    for dx in range(2):
-                        for dy in range(2):
-                            if dx == 0 and dy == 0:
-                                continue
-                            draw.text((x_pos + 15 + dx, y_pos + 12 + dy), date_text, fill='#8892b0', font=date_font)
-                    draw.text((x_pos + 15, y_pos + 12), date_text, fill='#8892b0', font=date_font)
+                    draw.text((x_pos + 15, y_pos + 12), date_text, fill='#8892b0', font=date_font,
+                              stroke_width=1, stroke_fill='#8892b0')
         
         # フッター
         footer_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         draw.text((20, height - 30), footer_text, fill='#8892b0', font=stats_font)
         
         # 画像を保存
-        output_path = "ogp_image.png"
-        img.save(output_path, quality=95)
-        return output_path
+        output_path = OGP_IMAGE_FILE
+        # SNSで配信される画像のためファイルサイズを優先して最適化する
+        # （optimize指定時、Pillowは最大圧縮レベルを使うためcompress_levelは指定しない）
+        img.save(output_path, format='PNG', optimize=True)
+        return output_path, bold_font
         
     except Exception as e:
         print(f"OGP画像生成エラー: {e}")
-        return ""
+        return "", False
 
 
-def parse_events(raw_events: List[Dict]) -> List[Event]:
+def parse_events(columns: Dict[str, int], raw_events: List[List[str]]) -> List[Event]:
     """生データをEventオブジェクトに変換"""
     events = []
     current_year = None
@@ -629,16 +916,19 @@ def parse_events(raw_events: List[Dict]) -> List[Event]:
     # 国名マッピングを読み込み
     country_mapping = load_country_mapping()
 
+    # 実際のスプレッドシート列名に基づく列位置
+    (name_i, location_i, region_i, date_from_i,
+     date_to_i, url_i, description_i, image_i) = (columns.get(name) for name in SHEET_COLUMNS)
+
     for raw in raw_events:
         try:
-            # 実際のスプレッドシート列名に基づくマッピング
-            name = raw.get('名称', '').strip()
-            location = raw.get('場所', '').strip()
-            region = raw.get('地域', '').strip()
-            date_from = raw.get('から', '').strip()
-            date_to = raw.get('まで', '').strip()
-            url = raw.get('URL', '').strip()
-            description = raw.get('備考', '').strip()
+            name = _cell(raw, name_i)
+            location = _cell(raw, location_i)
+            region = _cell(raw, region_i)
+            date_from = _cell(raw, date_from_i)
+            date_to = _cell(raw, date_to_i)
+            url = _cell(raw, url_i)
+            description = _cell(raw, description_i)
             
             # 年のヘッダー行を検出
             if name.endswith('年') and not location and not date_from:
@@ -689,8 +979,10 @@ def parse_events(raw_events: List[Dict]) -> List[Event]:
             # 地域列から国名を抽出（括弧内の国名を使用）
             country = extract_country_from_region(region, country_mapping) if region else "Japan"
             
-            # 画像URLは後で今後のイベントのみに対して取得する
-            image_url = ""
+            # シートに画像URLがあればそれを使い、なければ後で今後のイベントのみに対して取得する
+            image_url = _cell(raw, image_i)
+            if not image_url.startswith(('http://', 'https://')):
+                image_url = ""
             
             event_data = {
                 'name': name,
@@ -715,12 +1007,13 @@ def parse_events(raw_events: List[Dict]) -> List[Event]:
     return events
 
 
-def fetch_event_image(event: Event) -> Event:
-    """単一イベントの画像を取得"""
-    if event.url and not event.image_url:
-        print(f"🖼️  画像取得中: {event.name}")
-        event.image_url = extract_image_from_url(event.url)
-    return event
+def fetch_event_image(event: Event, cache_entry: Optional[Dict] = None) -> Optional[Dict]:
+    """単一イベントの画像を取得し、画像キャッシュのエントリを返す"""
+    print(f"🖼️  画像取得中: {event.name}")
+    entry = extract_image_from_url(event.url, cache_entry)
+    if entry:
+        event.image_url = entry.get('image_url', '')
+    return entry
 
 
 def filter_upcoming_events(events: List[Event], days_ahead: int = 730) -> List[Event]:
@@ -730,37 +1023,103 @@ def filter_upcoming_events(events: List[Event], days_ahead: int = 730) -> List[E
     # 今日の開始時刻（午前0時）を基準にする
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     
-    upcoming = []
-    for event in events:
-        # 複数日開催の場合は終了日も考慮
-        event_end_date = event.parsed_date_to if event.parsed_date_to else event.parsed_date
-        event_start_date = event.parsed_date_from if event.parsed_date_from else event.parsed_date
-        
-        # イベントが今日以降に終了する、または今後開始するイベントを含める
-        if event_end_date and event_end_date >= today_start and event_start_date and event_start_date <= cutoff_date:
-            upcoming.append(event)
+    # 開始日・終了日の判定を1パスで行う（複数日開催の場合は終了日も考慮）
+    # イベントが今日以降に終了する、かつ期限内に開始するイベントを含める
+    upcoming = [
+        event for event in events
+        if (end := event.parsed_date_to or event.parsed_date) and end >= today_start
+        and (start := event.parsed_date_from or event.parsed_date) and start <= cutoff_date
+    ]
     
     # 今後のイベントのみサムネイルを並行取得
     events_needing_images = [event for event in upcoming if event.url and not event.image_url]
     
     if events_needing_images:
-        print(f"🖼️  {len(events_needing_images)}件の画像を並行取得中...")
+        # 前回までに取得した画像URLが有効期限内ならそのまま再利用
+        image_cache = load_image_cache()
+        # 画像が見つからなかったホストの別URLは取得しない
+        no_image_hosts = {
+            host: recorded_at for host, recorded_at in load_no_image_hosts().items()
+            if is_within_ttl(recorded_at, now, NO_IMAGE_HOSTS_TTL)
+        }
+        events_to_fetch = []
+        skipped_count = 0
+        for event in events_needing_images:
+            entry = image_cache.get(event.url)
+            if entry and is_image_cache_fresh(entry, now):
+                event.image_url = entry.get('image_url', '')
+            elif urlparse(event.url).netloc in no_image_hosts:
+                skipped_count += 1
+            else:
+                events_to_fetch.append(event)
         
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = []
-            for i, event in enumerate(events_needing_images):
-                if i > 0:
-                    time.sleep(0.1)  # 短い間隔でタスクを開始
-                future = executor.submit(fetch_event_image, event)
-                futures.append(future)
+        cached_count = len(events_needing_images) - len(events_to_fetch) - skipped_count
+        if cached_count:
+            print(f"♻️  {cached_count}件の画像をキャッシュから再利用")
+        if skipped_count:
+            print(f"⏭️  画像のないサイトの{skipped_count}件は取得をスキップ")
+        
+        if events_to_fetch:
+            print(f"🖼️  {len(events_to_fetch)}件の画像を並行取得中...")
             
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"画像取得エラー: {e}")
+            empty_hosts = set()
+            # 同じサイトのイベントが多くても、そのホストへは同時にIMAGE_FETCH_PER_HOST件までしか
+            # 投入しない（待機中のタスクがワーカーを占有しないよう、プールに渡す前に制限する）
+            pending_by_host: Dict[str, deque] = {}
+            for event in events_to_fetch:
+                pending_by_host.setdefault(urlparse(event.url).netloc, deque()).append(event)
+            
+            # 結果は完了順に1件ずつ受け取り、1件の失敗が他の取得結果に影響しないようにする
+            # （各リクエストはrequestsのtimeoutで打ち切られる）
+            with ThreadPoolExecutor(max_workers=IMAGE_FETCH_WORKERS) as executor:
+                futures = {}
+                
+                def submit_next(host: str) -> None:
+                    if pending_by_host[host]:
+                        event = pending_by_host[host].popleft()
+                        futures[executor.submit(fetch_event_image, event, image_cache.get(event.url))] = event
+                
+                # ホストを順番に巡回して投入し、特定のホストがキューの先頭を占めないようにする
+                for _ in range(IMAGE_FETCH_PER_HOST):
+                    for host in pending_by_host:
+                        submit_next(host)
+                
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        event = futures.pop(future)
+                        # 完了したホストの次のイベントを投入する
+                        submit_next(urlparse(event.url).netloc)
+                        try:
+                            entry = future.result()
+                        except Exception as e:
+                            print(f"画像取得エラー ({event.url}): {e}")
+                            continue
+                        if entry:
+                            image_cache[event.url] = entry
+                            if not entry.get('image_url'):
+                                empty_hosts.add(urlparse(event.url).netloc)
+        
+            # 同じホストで画像が取得できているページがあれば記録しない（記録済みなら解除）
+            hosts_with_images = {
+                urlparse(url).netloc for url, entry in image_cache.items()
+                if is_image_cache_fresh(entry, now) and entry.get('image_url')
+            }
+            for host in empty_hosts - hosts_with_images:
+                no_image_hosts[host] = now.isoformat()
+            for host in hosts_with_images:
+                no_image_hosts.pop(host, None)
+        
+        # 期限切れのエントリを削除して保存
+        save_image_cache({
+            url: entry for url, entry in image_cache.items()
+            if is_image_cache_fresh(entry, now)
+        })
+        save_no_image_hosts(no_image_hosts)
     
-    return sorted(upcoming, key=lambda x: x.parsed_date or datetime.max)
+    # フィルタ済みのリストをその場で一度だけ日付順に並べる
+    upcoming.sort(key=lambda x: x.parsed_date or datetime.max)
+    return upcoming
 
 
 def format_event_date(event: Event) -> str:
@@ -796,19 +1155,45 @@ def format_event_date(event: Event) -> str:
             return f"{start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}"
 
 
-def generate_html(events: List[Event], template_dir: str = "templates") -> str:
-    """HTMLページを生成"""
-    
-    # テンプレートディレクトリを作成
-    Path(template_dir).mkdir(exist_ok=True)
-    
-    # OGP画像を生成
-    print("🖼️ OGP画像を生成中...")
-    ogp_image_path = create_ogp_image(events)
-    ogp_image_url = f"https://shinichi-ohki.github.io/maker_event/{ogp_image_path}" if ogp_image_path else "https://via.placeholder.com/1200x630/667eea/ffffff?text=Upcoming+Maker+Events"
-    
-    # デフォルトテンプレートを作成
-    template_content = """<!DOCTYPE html>
+# イベントカード（Jinja2を通さずstr.formatで組み立てる）
+_CARD_TMPL = """                <div class="event-card">
+                    <div class="event-image">
+                            {image}
+                    </div>
+                    <div class="event-content">
+{date}                        <h3 class="event-title">{name}</h3>
+                        <p class="event-location">{location}</p>
+{description}{link}                    </div>
+                </div>"""
+_CARD_IMAGE_TMPL = '<img src="{src}" alt="{alt}" style="width: 100%; height: 100%; object-fit: cover;">'
+_CARD_DATE_TMPL = '                        <div class="event-date">{date}</div>\n'
+_CARD_DESCRIPTION_TMPL = '                        <p class="event-description">{description}</p>\n'
+_CARD_LINK_TMPL = '                        <a href="{url}" class="event-link" target="_blank">{cta}</a>\n'
+
+
+def render_event_card(event: Event, cta: str) -> str:
+    """イベントカードのHTMLを生成（値はここでHTMLエスケープする）"""
+    esc = html.escape
+    if event.image_url:
+        image = _CARD_IMAGE_TMPL.format(src=esc(event.image_url), alt=esc(event.name))
+    else:
+        image = "🛠️"
+    description = ""
+    if event.display_description:
+        text = esc(event.display_description) + ("..." if event.description_truncated else "")
+        description = _CARD_DESCRIPTION_TMPL.format(description=text)
+    return _CARD_TMPL.format(
+        image=image,
+        date=_CARD_DATE_TMPL.format(date=esc(event.formatted_date)) if event.formatted_date else "",
+        name=esc(event.name),
+        location=esc(event.display_location),
+        description=description,
+        link=_CARD_LINK_TMPL.format(url=esc(event.url), cta=cta) if event.url else "",
+    )
+
+
+# ページの共通部分（str.format形式。TEMPLATE_SRCと0件用の固定ページの両方で使う）
+_PAGE_HEAD_SRC = """<!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
@@ -817,186 +1202,24 @@ def generate_html(events: List[Event], template_dir: str = "templates") -> str:
     
     <!-- OGP Meta Tags for Social Media Sharing -->
     <meta property="og:title" content="Upcoming Maker Events | 今後のメイカーイベント">
-    <meta property="og:description" content="世界中のメイカーイベント情報を一覧で確認。Maker Faire、NT、技術書典など{{ total_events }}件のイベント情報を掲載。 | Discover upcoming maker events worldwide including Maker Faires, technical conferences, and maker gatherings.">
+    <meta property="og:description" content="{meta_description_ja} | Discover upcoming maker events worldwide including Maker Faires, technical conferences, and maker gatherings.">
     <meta property="og:type" content="website">
     <meta property="og:url" content="https://shinichi-ohki.github.io/maker_event/">
-    <meta property="og:image" content="{{ ogp_image_url }}">
+    <meta property="og:image" content="{ogp_image_url}">
     <meta property="og:site_name" content="Maker Events">
     <meta property="og:locale" content="ja_JP">
     
     <!-- Twitter Card -->
     <meta name="twitter:card" content="summary_large_image">
     <meta name="twitter:title" content="Upcoming Maker Events | 今後のメイカーイベント">
-    <meta name="twitter:description" content="世界中のメイカーイベント情報を一覧で確認。{{ total_events }}件のイベント情報を掲載。">
-    <meta name="twitter:image" content="{{ ogp_image_url }}">
+    <meta name="twitter:description" content="{meta_description_short}">
+    <meta name="twitter:image" content="{ogp_image_url}">
     
     <!-- Standard Meta Tags -->
-    <meta name="description" content="世界中のメイカーイベント情報を一覧で確認。Maker Faire、NT、技術書典など{{ total_events }}件のイベント情報を掲載。">
+    <meta name="description" content="{meta_description_ja}">
     <meta name="keywords" content="Maker Faire, メイカーイベント, 技術イベント, NT, 技術書典, DIY, ハードウェア, プログラミング">
     <meta name="author" content="Maker Events Team">
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f8f9fa;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        header {
-            text-align: center;
-            margin-bottom: 40px;
-            padding: 40px 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border-radius: 10px;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-        }
-        
-        .subtitle {
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }
-        
-        .events-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 30px;
-            margin-top: 40px;
-        }
-        
-        .event-card {
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            overflow: hidden;
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-        
-        .event-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-        }
-        
-        .event-image {
-            width: 100%;
-            height: 200px;
-            background: linear-gradient(45deg, #667eea, #764ba2);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 3rem;
-        }
-        
-        .event-content {
-            padding: 25px;
-        }
-        
-        .event-date {
-            background: #667eea;
-            color: white;
-            padding: 8px 15px;
-            border-radius: 20px;
-            font-size: 0.9rem;
-            font-weight: bold;
-            display: inline-block;
-            margin-bottom: 15px;
-        }
-        
-        .event-title {
-            font-size: 1.4rem;
-            font-weight: bold;
-            margin-bottom: 10px;
-            color: #2c3e50;
-        }
-        
-        .event-location {
-            color: #7f8c8d;
-            margin-bottom: 15px;
-            display: flex;
-            align-items: center;
-        }
-        
-        .event-location::before {
-            content: "📍";
-            margin-right: 8px;
-        }
-        
-        .event-description {
-            color: #555;
-            font-size: 0.95rem;
-            line-height: 1.5;
-            margin-bottom: 20px;
-        }
-        
-        .event-link {
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            padding: 10px 20px;
-            text-decoration: none;
-            border-radius: 25px;
-            font-weight: bold;
-            transition: background 0.3s ease;
-        }
-        
-        .event-link:hover {
-            background: #5a67d8;
-        }
-        
-        .no-events {
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 1.2rem;
-            margin-top: 60px;
-        }
-        
-        .section-title {
-            font-size: 2rem;
-            margin: 40px 0 20px 0;
-            text-align: center;
-            color: #2c3e50;
-        }
-        
-        .japan-events {
-            margin-bottom: 60px;
-        }
-        
-        .international-events {
-            margin-bottom: 60px;
-        }
-        
-        @media (max-width: 768px) {
-            .events-grid {
-                grid-template-columns: 1fr;
-                gap: 20px;
-            }
-            
-            h1 {
-                font-size: 2rem;
-            }
-            
-            .container {
-                padding: 10px;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="style.css">
 </head>
 <body>
     <div class="container">
@@ -1005,77 +1228,15 @@ def generate_html(events: List[Event], template_dir: str = "templates") -> str:
             <p class="subtitle">今後のメイカーイベント | Discover maker events worldwide</p>
         </header>
         
-        {% if japan_events %}
-        <section class="japan-events">
-            <h2 class="section-title">🇯🇵 日本のイベント | Events in Japan</h2>
-            <div class="events-grid">
-                {% for event in japan_events %}
-                <div class="event-card">
-                    <div class="event-image">
-                        {% if event.image_url %}
-                            <img src="{{ event.image_url }}" alt="{{ event.name }}" style="width: 100%; height: 100%; object-fit: cover;">
-                        {% else %}
-                            🛠️
-                        {% endif %}
-                    </div>
-                    <div class="event-content">
-                        {% if event.parsed_date_from %}
-                        <div class="event-date">{{ format_event_date(event) }}</div>
-                        {% endif %}
-                        <h3 class="event-title">{{ event.name }}</h3>
-                        <p class="event-location">{{ event.location }}{% if event.country and event.country != event.location %}, {{ event.country }}{% endif %}</p>
-                        {% if event.description %}
-                        <p class="event-description">{{ event.description[:150] }}{% if event.description|length > 150 %}...{% endif %}</p>
-                        {% endif %}
-                        {% if event.url %}
-                        <a href="{{ event.url }}" class="event-link" target="_blank">詳細を見る</a>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            </div>
-        </section>
-        {% endif %}
-        
-        {% if international_events %}
-        <section class="international-events">
-            <h2 class="section-title">🌍 International Events | 海外のイベント</h2>
-            <div class="events-grid">
-                {% for event in international_events %}
-                <div class="event-card">
-                    <div class="event-image">
-                        {% if event.image_url %}
-                            <img src="{{ event.image_url }}" alt="{{ event.name }}" style="width: 100%; height: 100%; object-fit: cover;">
-                        {% else %}
-                            🛠️
-                        {% endif %}
-                    </div>
-                    <div class="event-content">
-                        {% if event.parsed_date_from %}
-                        <div class="event-date">{{ format_event_date(event) }}</div>
-                        {% endif %}
-                        <h3 class="event-title">{{ event.name }}</h3>
-                        <p class="event-location">{{ event.location }}{% if event.country and event.country != event.location %}, {{ event.country }}{% endif %}</p>
-                        {% if event.description %}
-                        <p class="event-description">{{ event.description[:150] }}{% if event.description|length > 150 %}...{% endif %}</p>
-                        {% endif %}
-                        {% if event.url %}
-                        <a href="{{ event.url }}" class="event-link" target="_blank">Learn More</a>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            </div>
-        </section>
-        {% endif %}
-        
-        {% if not japan_events and not international_events %}
-        <div class="no-events">
+"""
+
+_NO_EVENTS_SRC = """        <div class="no-events">
             <p>現在、今後のイベント情報はありません。<br>
             No upcoming events are currently scheduled.</p>
         </div>
-        {% endif %}
-    </div>
+"""
+
+_PAGE_FOOT_SRC = """    </div>
     
     <div style="text-align: center; margin: 2rem 0 1rem 0;">
         <h3 style="margin-bottom: 1rem; color: #333; font-size: 1.2rem;">イベントスケジュール | Event Timeline</h3>
@@ -1083,36 +1244,163 @@ def generate_html(events: List[Event], template_dir: str = "templates") -> str:
     </div>
     
     <footer style="text-align: center; margin-top: 1rem; padding: 1rem; color: #666; font-size: 0.8rem; border-top: 1px solid #e0e0e0;">
-        <p>Last updated: {{ last_updated }}</p>
+        <p>Last updated: {last_updated}</p>
     </footer>
 </body>
 </html>"""
+
+# メタタグの説明文（{total_events}はイベント件数）
+_META_DESCRIPTION_JA = "世界中のメイカーイベント情報を一覧で確認。Maker Faire、NT、技術書典など{total_events}件のイベント情報を掲載。"
+_META_DESCRIPTION_SHORT = "世界中のメイカーイベント情報を一覧で確認。{total_events}件のイベント情報を掲載。"
+
+# ページテンプレート（共通部分の差し込み位置をJinja2の変数にする）
+_JINJA_FIELDS = {
+    name: "{{ %s }}" % name
+    for name in ('meta_description_ja', 'meta_description_short', 'ogp_image_url', 'last_updated')
+}
+TEMPLATE_SRC = (
+    _PAGE_HEAD_SRC.format(**_JINJA_FIELDS)
+    + """        {% for cls, title, cards in sections %}
+        <section class="{{ cls }}">
+            <h2 class="section-title">{{ title }}</h2>
+            <div class="events-grid">
+{{ cards }}
+            </div>
+        </section>
+        
+        {% endfor %}
+        {% if not sections %}
+"""
+    + _NO_EVENTS_SRC
+    + """        {% endif %}
+"""
+    + _PAGE_FOOT_SRC.format(**_JINJA_FIELDS)
+)
+
+
+# イベントが0件の場合のページ（TEMPLATE_SRCを0件でレンダリングした結果と同じ内容）
+# ogp_image_urlとlast_updatedは実行時にstr.formatで埋め込む
+_EMPTY_PAGE_HTML = (
+    _PAGE_HEAD_SRC.format(
+        meta_description_ja=_META_DESCRIPTION_JA.format(total_events=0),
+        meta_description_short=_META_DESCRIPTION_SHORT.format(total_events=0),
+        ogp_image_url="{ogp_image_url}",
+        last_updated="{last_updated}",
+    )
+    + _NO_EVENTS_SRC
+    + _PAGE_FOOT_SRC.format(ogp_image_url="{ogp_image_url}", last_updated="{last_updated}")
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_page_template() -> "Template":
+    """ページテンプレートを取得（Jinja2環境の構築とコンパイルは初回のみ）"""
+    from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, select_autoescape
+    
+    # イベント名や備考はスプレッドシート由来のためHTMLエスケープする
+    env = Environment(
+        loader=DictLoader({'index.html': TEMPLATE_SRC}),
+        autoescape=select_autoescape(['html']),
+        auto_reload=False,
+        cache_size=400,
+        # ブロックタグ行の余分な空白・改行を出力しない
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
     
-    template_path = Path(template_dir) / "index.html"
-    template_path.write_text(template_content, encoding='utf-8')
+    # コンパイル済みバイトコードをディスクに保存し、次回以降の実行でも再利用する
+    # （from_stringのテンプレートはバイトコードキャッシュを使わないためローダー経由で読み込む）
+    # キャッシュはテンプレートのソースでしか区別されないため、コンパイル結果に
+    # 影響する設定をファイル名に含めて設定変更時に古いバイトコードを使わないようにする
+    cache_dir = Path(JINJA_CACHE_DIR)
+    cache_dir.mkdir(exist_ok=True)
+    settings = repr((env.trim_blocks, env.lstrip_blocks, env.autoescape('index.html')))
+    settings_tag = hashlib.sha256(settings.encode('utf-8')).hexdigest()[:12]
+    env.bytecode_cache = FileSystemBytecodeCache(
+        str(cache_dir), f'__jinja2_{settings_tag}_%s.cache'
+    )
+    return env.get_template('index.html')
+
+
+def partition_events(events: List[Event]) -> tuple[List[Event], List[Event]]:
+    """イベントを日本と海外に1パスで分類
+    
+    Returns:
+        tuple[List[Event], List[Event]]: (日本のイベント, 海外のイベント)
+    """
+    japan_events, international_events = [], []
+    for e in events:
+        (japan_events if e.is_japan else international_events).append(e)
+    return japan_events, international_events
+
+
+def prepare_display_fields(events: List[Event]) -> None:
+    """テンプレートで表示する値をレンダリング前に一度だけ計算"""
+    for e in events:
+        e.display_location = e.location
+        if e.country and e.country != e.location:
+            e.display_location += f", {e.country}"
+        e.display_description = e.description[:DESCRIPTION_MAX_LENGTH]
+        e.description_truncated = len(e.description) > DESCRIPTION_MAX_LENGTH
+        e.formatted_date = format_event_date(e)
+
+
+def generate_html(events: List[Event], japan_events: List[Event],
+                  international_events: List[Event], reuse_ogp_image: bool = False) -> tuple[str, bool]:
+    """HTMLページを生成
     
-    # イベントを日本と海外に分類
-    japan_events = [e for e in events if e.is_japan]
-    international_events = [e for e in events if not e.is_japan]
+    japan_events / international_eventsはpartition_eventsで分類済みのイベント。
+    reuse_ogp_imageがTrueの場合はOGP画像を再生成せず既存の画像を使用する。
     
-    # Jinja2でレンダリング
-    env = Environment(loader=FileSystemLoader(template_dir))
-    env.globals['format_event_date'] = format_event_date
-    template = env.get_template("index.html")
+    Returns:
+        tuple[str, bool]: (HTML, OGP画像をBoldフォントで生成できたか、または既存の画像を再利用したか)
+    """
     
+    if reuse_ogp_image:
+        print("⏭️  イベント内容に変更がないため、既存のOGP画像を使用します")
+        ogp_image_path = OGP_IMAGE_FILE
+        ogp_image_ok = True
+    else:
+        # OGP画像を生成
+        print("🖼️ OGP画像を生成中...")
+        ogp_image_path, bold_font = create_ogp_image(events)
+        ogp_image_ok = bool(ogp_image_path) and bold_font
+    ogp_image_url = f"https://shinichi-ohki.github.io/maker_event/{ogp_image_path}" if ogp_image_path else "https://via.placeholder.com/1200x630/667eea/ffffff?text=Upcoming+Maker+Events"
+
     # 現在の日時を取得（日本時間）
-    from datetime import timezone, timedelta
-    jst = timezone(timedelta(hours=9))
-    now_jst = datetime.now(jst)
-    last_updated = now_jst.strftime("%Y-%m-%d %H:%M JST")
-    
-    return template.render(
-        japan_events=japan_events,
-        international_events=international_events,
-        total_events=len(events),
+    last_updated = datetime.now(JST).strftime("%Y-%m-%d %H:%M JST")
+    
+    # イベントがない場合はテンプレートを使わず固定のページを返す
+    if not events:
+        return _EMPTY_PAGE_HTML.format(
+            ogp_image_url=html.escape(ogp_image_url), last_updated=last_updated
+        ), ogp_image_ok
+    
+    from markupsafe import Markup
+    
+    # 表示用の値を事前計算し、カード部分はstr.formatで組み立ててから
+    # Jinja2でページ全体をレンダリング
+    prepare_display_fields(events)
+    total_events = len(events)
+    # 日本・海外のセクションは見出しとボタン文言だけが異なるため、
+    # イベントがある分だけ (クラス名, 見出し, カードHTML) を渡してループで出力する
+    # カードはrender_event_cardでエスケープ済みのため、Markupとして渡し再エスケープを避ける
+    sections = [
+        (cls, title, Markup("\n".join(render_event_card(e, cta) for e in section_events)))
+        for cls, title, cta, section_events in (
+            ("japan-events", "🇯🇵 日本のイベント | Events in Japan", "詳細を見る", japan_events),
+            ("international-events", "🌍 International Events | 海外のイベント", "Learn More", international_events),
+        )
+        if section_events
+    ]
+    page = _get_page_template().render(
+        sections=sections,
+        meta_description_ja=_META_DESCRIPTION_JA.format(total_events=total_events),
+        meta_description_short=_META_DESCRIPTION_SHORT.format(total_events=total_events),
         ogp_image_url=ogp_image_url,
         last_updated=last_updated
     )
+    return page, ogp_image_ok
 
 
 def main():
@@ -1140,31 +1428,46 @@ def main():
         current_hash = ""
     
     print("🔄 Google Sheetsからデータを取得中...")
-    raw_events = fetch_events_from_sheet(sheet_url)
+    columns, raw_events = fetch_events_from_sheet(sheet_url)
     print(f"✅ {len(raw_events)}件の生データを取得しました")
     
     print("🔄 イベントデータを解析中...")
-    events = parse_events(raw_events)
+    events = parse_events(columns, raw_events)
     print(f"✅ {len(events)}件のイベントを解析しました")
     
     print("🔄 今後のイベントをフィルタリング中...")
     upcoming_events = filter_upcoming_events(events)
     print(f"✅ {len(upcoming_events)}件の今後のイベントを抽出しました")
     
+    # 前回とイベント内容が同じならOGP画像の再生成をスキップ（--force時は常に再生成）
+    events_hash = get_events_hash(upcoming_events)
+    reuse_ogp_image = (
+        not args.force
+        and events_hash == load_last_state().get('events_hash')
+        and Path(OGP_IMAGE_FILE).exists()
+    )
+    
+    # イベントを日本と海外に分類（HTML生成と統計情報で共用）
+    japan_events, international_events = partition_events(upcoming_events)
+    
     print("🔄 HTMLページを生成中...")
-    html_content = generate_html(upcoming_events)
+    html_content, ogp_image_ok = generate_html(
+        upcoming_events, japan_events, international_events, reuse_ogp_image=reuse_ogp_image
+    )
     
+    # 内容が同じ場合は書き込まない
     output_path = Path("index.html")
-    output_path.write_text(html_content, encoding='utf-8')
-    print(f"✅ HTMLページを生成しました: {output_path.absolute()}")
+    new_bytes = html_content.encode('utf-8')
+    if output_path.exists() and output_path.read_bytes() == new_bytes:
+        print("⏭️  HTMLに変更がないため、書き込みをスキップしました")
+    else:
+        output_path.write_bytes(new_bytes)
+        print(f"✅ HTMLページを生成しました: {output_path.absolute()}")
     
     # 統計情報を表示
-    japan_count = len([e for e in upcoming_events if e.is_japan])
-    international_count = len([e for e in upcoming_events if not e.is_japan])
-    
     print(f"\n📊 統計情報:")
-    print(f"   日本のイベント: {japan_count}件")
-    print(f"   海外のイベント: {international_count}件")
+    print(f"   日本のイベント: {len(japan_events)}件")
+    print(f"   海外のイベント: {len(international_events)}件")
     print(f"   合計: {len(upcoming_events)}件")
     
     # 成功時に現在の状態を保存（--forceモードの場合は現在のハッシュを取得）
@@ -1174,8 +1477,12 @@ def main():
     state = {
         'content_hash': current_hash,
         'last_updated': datetime.now().isoformat(),
-        'event_count': len(upcoming_events)
+        'event_count': len(upcoming_events),
     }
+    # OGP画像の生成に失敗した場合や代替フォントで描画した場合は、次回の実行で
+    # その画像を再利用せず作り直すようイベントのハッシュを保存しない
+    if ogp_image_ok:
+        state['events_hash'] = events_hash
     save_last_state(state)
     print(f"💾 状態を保存しました: {current_hash[:8]}")
     